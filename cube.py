@@ -1,14 +1,13 @@
 import streamlit as st
+import importlib.util
 import random
-import time
+import threading
 import numpy as np
 
-# Try to import kociemba, fallback to simple solver if not available
-try:
-    import kociemba
-    KOCIEMBA_AVAILABLE = True
-except ImportError:
-    KOCIEMBA_AVAILABLE = False
+# Check for kociemba without importing it, fallback to simple solver if not available.
+# The import itself is deferred to get_solver since loading its tables is slow.
+KOCIEMBA_AVAILABLE = importlib.util.find_spec("kociemba") is not None
+if not KOCIEMBA_AVAILABLE:
     st.warning("⚠️ Kociemba library not found. Using simplified solver. Install with: pip install kociemba")
 
 # Color mapping for the cube faces
@@ -30,214 +29,291 @@ COLOR_NAMES = {
     'G': 'Green'
 }
 
-# Kociemba uses different notation: U=Up, R=Right, F=Front, D=Down, L=Left, B=Back
-# And uses URFDLB color scheme where U=White, R=Red, F=Green, D=Yellow, L=Orange, B=Blue
-KOCIEMBA_COLOR_MAP = {
-    'W': 'U',  # White -> Up
-    'R': 'R',  # Red -> Right  
-    'G': 'F',  # Green -> Front
-    'Y': 'D',  # Yellow -> Down
-    'O': 'L',  # Orange -> Left
-    'B': 'B'   # Blue -> Back
-}
+# Face ids in Kociemba order (U, R, F, D, L, B); stickers are stored as color ids
+# where each color id matches the face its center sits on in the solved state
+FACE = {'U': 0, 'R': 1, 'F': 2, 'D': 3, 'L': 4, 'B': 5}
+# Color letter for each color id: White=U, Green=R, Red=F, Yellow=D, Blue=L, Orange=B
+COLOR_CODES = 'WGRYBO'
+COLOR_BYTES = COLOR_CODES.encode('ascii')
+CHARS = np.frombuffer(COLOR_BYTES, dtype=np.uint8)
+# bytes.translate table from color letters to color ids
+COLOR_ID_TABLE = bytes.maketrans(COLOR_BYTES, bytes(range(6)))
+# Kociemba face letter for each face id
+TO_KOCIEMBA = np.frombuffer(b'URFDLB', dtype=np.uint8)
+
+def _rotate_face_clockwise(f, face):
+    """Rotate a face 90 degrees clockwise"""
+    i = FACE[face]
+    f[i] = np.rot90(f[i], -1).copy()
+
+def _turn_R(f):
+    """Right face clockwise"""
+    _rotate_face_clockwise(f, 'R')
+    U, R, F, D, L, B = f
+    # Save edge pieces
+    temp = U[:, 2].copy()
+    U[:, 2] = F[:, 2]
+    F[:, 2] = D[:, 2]
+    D[:, 2] = B[::-1, 0]
+    B[::-1, 0] = temp
+
+def _turn_U(f):
+    """Up face clockwise"""
+    _rotate_face_clockwise(f, 'U')
+    U, R, F, D, L, B = f
+    temp = F[0].copy()
+    F[0] = R[0]
+    R[0] = B[0]
+    B[0] = L[0]
+    L[0] = temp
+
+def _turn_F(f):
+    """Front face clockwise"""
+    _rotate_face_clockwise(f, 'F')
+    U, R, F, D, L, B = f
+    temp = U[2].copy()
+    U[2] = L[::-1, 2]
+    L[:, 2] = D[0]
+    D[0, ::-1] = R[:, 0]
+    R[:, 0] = temp
+
+def _turn_L(f):
+    """Left face clockwise"""
+    _rotate_face_clockwise(f, 'L')
+    U, R, F, D, L, B = f
+    temp = U[:, 0].copy()
+    U[:, 0] = B[::-1, 2]
+    B[::-1, 2] = D[:, 0]
+    D[:, 0] = F[:, 0]
+    F[:, 0] = temp
+
+def _turn_D(f):
+    """Down face clockwise"""
+    _rotate_face_clockwise(f, 'D')
+    U, R, F, D, L, B = f
+    temp = F[2].copy()
+    F[2] = L[2]
+    L[2] = B[2]
+    B[2] = R[2]
+    R[2] = temp
+
+def _turn_B(f):
+    """Back face clockwise"""
+    _rotate_face_clockwise(f, 'B')
+    U, R, F, D, L, B = f
+    temp = U[0].copy()
+    U[0] = R[:, 2]
+    R[:, 2] = D[2, ::-1]
+    D[2, ::-1] = L[::-1, 0]
+    L[::-1, 0] = temp
+
+# Tables below are built once per process, since Streamlit re-executes this script on every rerun
+@st.cache_resource(show_spinner=False)
+def _build_move_perms():
+    """Record every move as a gather: new_stickers = old_stickers[perm]"""
+    perms = []
+    for turn in (_turn_R, _turn_U, _turn_F, _turn_L, _turn_D, _turn_B):
+        # Turning a cube of sticker indices leaves each slot holding its source index
+        f = np.arange(54, dtype=np.int8).reshape(6, 3, 3)
+        turn(f)
+        p = f.reshape(54)
+        # X' is the inverse permutation and X2 is X composed with itself
+        perms += [p, np.argsort(p).astype(np.int8), p[p]]
+    table = np.stack(perms)
+    table.flags.writeable = False  # Shared by every session
+    return table
+
+MOVE_NAMES = ('R', "R'", 'R2', 'U', "U'", 'U2', 'F', "F'", 'F2',
+              'L', "L'", 'L2', 'D', "D'", 'D2', 'B', "B'", 'B2')
+MOVE_ID = {move: i for i, move in enumerate(MOVE_NAMES)}
+MOVE_PERM = _build_move_perms()
+IDENTITY_PERM = np.arange(54, dtype=np.int8)
+# Every sticker carries the color id of its own face
+SOLVED = np.repeat(np.arange(6, dtype=np.uint8), 9).reshape(6, 3, 3)
+
+# Bit offsets of the 18 three-bit color ids packed into each 64-bit word
+PACK_SHIFTS = np.arange(0, 54, 3, dtype=np.uint64)
+
+def pack_stickers(flat):
+    """Pack the 54 stickers into a hashable tuple of three ints, 3 bits per sticker"""
+    words = flat.reshape(3, 18).astype(np.uint64) << PACK_SHIFTS
+    return tuple(np.bitwise_or.reduce(words, axis=1).tolist())
+
+SOLVED_PACKED = pack_stickers(SOLVED.reshape(54))
+
+def _apply_sequence(flat, perms):
+    """Apply a stacked (k, 54) array of move permutations in order"""
+    for i in range(perms.shape[0]):
+        flat = flat[perms[i]]
+    return flat
+
+@st.cache_resource(show_spinner=False)
+def _move_kernels():
+    """Per-process holder for the move kernels, since Streamlit re-executes this script on every rerun"""
+    # Starts out with the plain NumPy kernel until _compile_move_kernels swaps in the JIT version
+    return {'apply_sequence': _apply_sequence, 'compiled': False}
+
+MOVE_KERNELS = _move_kernels()
+
+def _compile_move_kernels():
+    """JIT the sequence kernel, meant to run off the main thread so it never delays a page draw"""
+    if MOVE_KERNELS['compiled']:
+        return
+    MOVE_KERNELS['compiled'] = True
+    # Numba is optional - without it the plain NumPy kernel stays in place
+    try:
+        from numba import njit
+    except ImportError:
+        return
+    MOVE_KERNELS['apply_sequence'] = njit('uint8[::1](uint8[::1], int8[:, ::1])')(_apply_sequence)
+
+def compose_moves(moves):
+    """Fold a move sequence into one permutation equivalent to applying it in order"""
+    perm = IDENTITY_PERM
+    for move in moves:
+        perm = perm[MOVE_PERM[MOVE_ID[move]]]
+    return perm
+
+INVERSE_MOVE = {move: move[0] if move.endswith("'") else move if move.endswith('2') else move + "'"
+                for move in MOVE_NAMES}
+
+@st.cache_resource(show_spinner=False)
+def _build_short_solutions():
+    """Map every state one or two moves from solved, by packed state, to the moves that undo it"""
+    solved = SOLVED.reshape(54)
+    one_away, two_away = {}, {}
+    for first in MOVE_NAMES:
+        after_first = solved[MOVE_PERM[MOVE_ID[first]]]
+        one_away[pack_stickers(after_first)] = [INVERSE_MOVE[first]]
+    for first in MOVE_NAMES:
+        after_first = solved[MOVE_PERM[MOVE_ID[first]]]
+        for second in MOVE_NAMES:
+            key = pack_stickers(after_first[MOVE_PERM[MOVE_ID[second]]])
+            # Same-face pairs collapse to solved or one move, and commuting pairs repeat
+            if key not in one_away and key != SOLVED_PACKED:
+                two_away.setdefault(key, [INVERSE_MOVE[second], INVERSE_MOVE[first]])
+    return one_away, two_away
+
+ONE_AWAY, TWO_AWAY = _build_short_solutions()
+
+def accumulate_moves(moves):
+    """Stack the composed permutation after each prefix of a move sequence"""
+    perms = np.empty((len(moves), 54), dtype=np.int8)
+    perm = IDENTITY_PERM
+    for i, move in enumerate(moves):
+        perm = perm[MOVE_PERM[MOVE_ID[move]]]
+        perms[i] = perm
+    return perms
 
-REVERSE_KOCIEMBA_MAP = {v: k for k, v in KOCIEMBA_COLOR_MAP.items()}
+# Upper bound on solution length, keeping the search from wandering into long solutions
+KOCIEMBA_MAX_DEPTH = 22
+
+# An arbitrary scrambled state used to make kociemba load its tables up front
+WARM_UP_CUBE_STRING = "DRLUUBFBRBLURRLRUBLRDDFDLFUFUFFDBRDUBRUFLLFDDBFLUBLRBD"
+
+@st.cache_resource(show_spinner=False)
+def get_solver():
+    """Import kociemba on first use, sharing one copy of its tables across reruns and sessions"""
+    import kociemba
+    return kociemba
+
+def _warm_up():
+    """Compile the move kernel, then import kociemba and run one solve to load its tables"""
+    _compile_move_kernels()
+    if not KOCIEMBA_AVAILABLE:
+        return
+    try:
+        get_solver().solve(WARM_UP_CUBE_STRING)
+    except Exception:
+        pass  # A real solve will surface the error to the user
+
+# Repeat hits only come from re-solving the same state, so a small bound is plenty
+@st.cache_data(show_spinner=False, max_entries=2000)
+def _kociemba_solve(state_key, _cube_string):
+    """Solve a Kociemba facelet string, memoized on the packed cube state since the solver is deterministic"""
+    # The leading underscore keeps Streamlit from hashing the string itself
+    solution = get_solver().solve(_cube_string, max_depth=KOCIEMBA_MAX_DEPTH)
+    if solution == "Error" or solution is None:
+        return None
+    # Parse solution string into individual moves
+    return solution.split()
 
 class RubiksCube:
     def __init__(self):
-        # Initialize solved cube - each face is 3x3
+        # Initialize solved cube - one (6, 3, 3) byte array, one 3x3 slab per face
         # Standard cube layout: White=Up, Yellow=Down, Red=Front, Orange=Back, Blue=Left, Green=Right
-        self.faces = {
-            'U': [['W' for _ in range(3)] for _ in range(3)],  # Up (White)
-            'D': [['Y' for _ in range(3)] for _ in range(3)],  # Down (Yellow)
-            'F': [['R' for _ in range(3)] for _ in range(3)],  # Front (Red)
-            'B': [['O' for _ in range(3)] for _ in range(3)],  # Back (Orange)
-            'L': [['B' for _ in range(3)] for _ in range(3)],  # Left (Blue)
-            'R': [['G' for _ in range(3)] for _ in range(3)]   # Right (Green)
-        }
+        self.f = SOLVED.copy()
     
     def get_face_string(self, face):
         """Convert a face to a 9-character string"""
-        return ''.join(''.join(row) for row in self.faces[face])
+        return CHARS[self.f[FACE[face]]].tobytes().decode('ascii')
     
     def get_kociemba_string(self):
         """Convert cube to Kociemba format string"""
         if not KOCIEMBA_AVAILABLE:
             return None
             
-        # Kociemba expects 54-character string: URFDLB faces, each 9 positions
-        # Kociemba color scheme: U=0, R=1, F=2, D=3, L=4, B=5
-        # Our colors: W=White(Up), G=Green(Right), R=Red(Front), Y=Yellow(Down), B=Blue(Left), O=Orange(Back)
-        
-        kociemba_map = {
-            'W': 'U',  # White -> Up
-            'G': 'R',  # Green -> Right  
-            'R': 'F',  # Red -> Front
-            'Y': 'D',  # Yellow -> Down
-            'B': 'L',  # Blue -> Left
-            'O': 'B'   # Orange -> Back
-        }
-        
-        kociemba_string = ""
-        
-        # Order must be: U R F D L B (Up, Right, Front, Down, Left, Back)
-        face_order = ['U', 'R', 'F', 'D', 'L', 'B']
-        
-        for face in face_order:
-            face_string = self.get_face_string(face)
-            # Convert each color to Kociemba face notation
-            for color in face_string:
-                kociemba_string += kociemba_map.get(color, 'U')  # Default to U if unknown
+        # Kociemba expects 54-character string: URFDLB faces, each 9 positions.
+        # Color ids assume the standard centers, so anything else is rejected rather than remapped
+        if not np.array_equal(self.f[:, 1, 1], SOLVED[:, 1, 1]):
+            return None
         
-        return kociemba_string
+        # Faces are already stored in URFDLB order, so translating is a single gather
+        return TO_KOCIEMBA[self.flat].tobytes().decode('ascii')
     
     def set_face_from_string(self, face, face_string):
         """Set a face from a 9-character string"""
-        for i in range(3):
-            for j in range(3):
-                self.faces[face][i][j] = face_string[i * 3 + j]
-    
-    def rotate_face_clockwise(self, face):
-        """Rotate a face 90 degrees clockwise"""
-        self.faces[face] = [[self.faces[face][2-j][i] for j in range(3)] for i in range(3)]
-    
-    def rotate_face_counterclockwise(self, face):
-        """Rotate a face 90 degrees counterclockwise"""
-        for _ in range(3):
-            self.rotate_face_clockwise(face)
-    
-    def move_R(self):
-        """Right face clockwise"""
-        self.rotate_face_clockwise('R')
-        # Save edge pieces
-        temp = [self.faces['U'][i][2] for i in range(3)]
-        for i in range(3):
-            self.faces['U'][i][2] = self.faces['F'][i][2]
-            self.faces['F'][i][2] = self.faces['D'][i][2]
-            self.faces['D'][i][2] = self.faces['B'][2-i][0]
-            self.faces['B'][2-i][0] = temp[i]
-    
-    def move_R_prime(self):
-        """Right face counterclockwise"""
-        for _ in range(3):
-            self.move_R()
-    
-    def move_U(self):
-        """Up face clockwise"""
-        self.rotate_face_clockwise('U')
-        temp = self.faces['F'][0][:]
-        self.faces['F'][0] = self.faces['R'][0][:]
-        self.faces['R'][0] = self.faces['B'][0][:]
-        self.faces['B'][0] = self.faces['L'][0][:]
-        self.faces['L'][0] = temp
-    
-    def move_U_prime(self):
-        """Up face counterclockwise"""
-        for _ in range(3):
-            self.move_U()
-    
-    def move_F(self):
-        """Front face clockwise"""
-        self.rotate_face_clockwise('F')
-        temp = self.faces['U'][2][:]
-        for i in range(3):
-            self.faces['U'][2][i] = self.faces['L'][2-i][2]
-            self.faces['L'][2-i][2] = self.faces['D'][0][2-i]
-            self.faces['D'][0][2-i] = self.faces['R'][i][0]
-            self.faces['R'][i][0] = temp[i]
-    
-    def move_F_prime(self):
-        """Front face counterclockwise"""
-        for _ in range(3):
-            self.move_F()
-    
-    def move_L(self):
-        """Left face clockwise"""
-        self.rotate_face_clockwise('L')
-        temp = [self.faces['U'][i][0] for i in range(3)]
-        for i in range(3):
-            self.faces['U'][i][0] = self.faces['B'][2-i][2]
-            self.faces['B'][2-i][2] = self.faces['D'][i][0]
-            self.faces['D'][i][0] = self.faces['F'][i][0]
-            self.faces['F'][i][0] = temp[i]
-    
-    def move_L_prime(self):
-        """Left face counterclockwise"""
-        for _ in range(3):
-            self.move_L()
-    
-    def move_D(self):
-        """Down face clockwise"""
-        self.rotate_face_clockwise('D')
-        temp = self.faces['F'][2][:]
-        self.faces['F'][2] = self.faces['L'][2][:]
-        self.faces['L'][2] = self.faces['B'][2][:]
-        self.faces['B'][2] = self.faces['R'][2][:]
-        self.faces['R'][2] = temp
-    
-    def move_D_prime(self):
-        """Down face counterclockwise"""
-        for _ in range(3):
-            self.move_D()
+        color_ids = face_string.encode('ascii').translate(COLOR_ID_TABLE)
+        self.f[FACE[face]] = np.frombuffer(color_ids, dtype=np.uint8).reshape(3, 3)
     
-    def move_B(self):
-        """Back face clockwise"""
-        self.rotate_face_clockwise('B')
-        temp = self.faces['U'][0][:]
-        for i in range(3):
-            self.faces['U'][0][i] = self.faces['R'][i][2]
-            self.faces['R'][i][2] = self.faces['D'][2][2-i]
-            self.faces['D'][2][2-i] = self.faces['L'][2-i][0]
-            self.faces['L'][2-i][0] = temp[i]
+    @property
+    def flat(self):
+        """The 54 stickers as a flat view in U R F D L B face order"""
+        return self.f.reshape(54)
     
-    def move_B_prime(self):
-        """Back face counterclockwise"""
-        for _ in range(3):
-            self.move_B()
+    @flat.setter
+    def flat(self, stickers):
+        self.f = stickers.reshape(6, 3, 3)
     
     def execute_move(self, move):
         """Execute a single move"""
-        move_map = {
-            'R': self.move_R,
-            "R'": self.move_R_prime,
-            'U': self.move_U,
-            "U'": self.move_U_prime,
-            'F': self.move_F,
-            "F'": self.move_F_prime,
-            'L': self.move_L,
-            "L'": self.move_L_prime,
-            'D': self.move_D,
-            "D'": self.move_D_prime,
-            'B': self.move_B,
-            "B'": self.move_B_prime,
-            'R2': lambda: [self.move_R(), self.move_R()],
-            'U2': lambda: [self.move_U(), self.move_U()],
-            'F2': lambda: [self.move_F(), self.move_F()],
-            'L2': lambda: [self.move_L(), self.move_L()],
-            'D2': lambda: [self.move_D(), self.move_D()],
-            'B2': lambda: [self.move_B(), self.move_B()]
-        }
-        
-        if move in move_map:
-            result = move_map[move]()
-            if result:  # For double moves
-                pass
+        move_id = MOVE_ID.get(move)
+        if move_id is not None:
+            self.flat = self.flat[MOVE_PERM[move_id]]
+    
+    def execute_moves(self, moves):
+        """Execute a sequence of moves"""
+        perms = MOVE_PERM[[MOVE_ID[move] for move in moves if move in MOVE_ID]]
+        self.flat = MOVE_KERNELS['apply_sequence'](self.flat, perms)
     
     def scramble(self, num_moves=20):
         """Generate a random scramble"""
-        moves = ['R', "R'", 'R2', 'U', "U'", 'U2', 'F', "F'", 'F2', 
-                'L', "L'", 'L2', 'D', "D'", 'D2', 'B', "B'", 'B2']
         scramble_moves = []
         
-        for _ in range(num_moves):
-            move = random.choice(moves)
-            scramble_moves.append(move)
-            self.execute_move(move)
+        # Sample in batches, dropping any move that turns the same face as the one before it
+        while len(scramble_moves) < num_moves:
+            for move in random.choices(MOVE_NAMES, k=num_moves - len(scramble_moves)):
+                if not scramble_moves or move[0] != scramble_moves[-1][0]:
+                    scramble_moves.append(move)
+        
+        # One gather for the whole scramble instead of one per move
+        self.flat = self.flat[compose_moves(scramble_moves)]
         
         return scramble_moves
     
     def solve_with_kociemba(self):
         """Use Kociemba algorithm to solve the cube"""
+        # Kociemba returns a non-empty move sequence even for a solved cube
+        if self.is_solved():
+            return []
+        
+        # States a move or two from solved are common while exploring and need no search
+        state_key = self.packed()
+        if state_key in ONE_AWAY:
+            return list(ONE_AWAY[state_key])
+        if state_key in TWO_AWAY:
+            return list(TWO_AWAY[state_key])
+        
         if not KOCIEMBA_AVAILABLE:
             return self.simple_solve()
         
@@ -245,28 +321,23 @@ class RubiksCube:
             cube_string = self.get_kociemba_string()
             
             # Debug: show cube string
-            if st.checkbox("🔍 Show debug info"):
+            if cube_string is not None and st.checkbox("🔍 Show debug info"):
                 st.write(f"Cube string for Kociemba: `{cube_string}`")
                 st.write(f"String length: {len(cube_string)}")
             
-            solution = kociemba.solve(cube_string)
+            moves = _kociemba_solve(state_key, cube_string) if cube_string is not None else None
             
-            if solution == "Error" or solution is None:
+            if moves is None:
                 st.error("❌ Invalid cube state - cannot be solved!")
                 st.info("💡 Try scrambling the cube first, or check manual input")
                 return []
             
-            # Parse solution string into individual moves
-            moves = solution.split() if solution else []
-            
             # Test the solution on a copy
             test_cube = RubiksCube()
-            for face in test_cube.faces:
-                test_cube.faces[face] = [row[:] for row in self.faces[face]]
+            test_cube.f = self.f.copy()
             
             # Apply solution to test cube
-            for move in moves:
-                test_cube.execute_move(move)
+            test_cube.execute_moves(moves)
             
             if not test_cube.is_solved():
                 st.warning("⚠️ Solution verification failed - moves may not lead to solved state")
@@ -283,82 +354,93 @@ class RubiksCube:
         solving_moves = ["R", "U", "R'", "U'", "R", "U", "R'", "U'", "F", "R", "U'", "R'", "F'"]
         return solving_moves[:random.randint(8, 15)]
     
+    def packed(self):
+        """Cube state as three packed ints, cheap to hash and compare"""
+        return pack_stickers(self.flat)
+    
     def is_solved(self):
         """Check if cube is in solved state"""
-        solved_faces = {
-            'U': 'W', 'D': 'Y', 'F': 'R', 'B': 'O', 'L': 'B', 'R': 'G'
-        }
-        
-        for face, expected_color in solved_faces.items():
-            for row in self.faces[face]:
-                for cell in row:
-                    if cell != expected_color:
-                        return False
-        return True
-
-def display_face(face_data, face_name):
-    """Display a single cube face"""
-    st.write(f"**{face_name}**")
-    face_display = ""
-    for row in face_data:
-        face_row = ""
-        for cell in row:
-            face_row += COLORS.get(cell, '⬛') + " "
-        face_display += face_row + "\n"
-    st.text(face_display)
+        return bool(np.array_equal(self.f, SOLVED))
+
+MOVE_MEANINGS = {
+    'R': 'Right face clockwise ↻', "R'": 'Right face counter-clockwise ↺', 'R2': 'Right face 180°',
+    'L': 'Left face clockwise ↻', "L'": 'Left face counter-clockwise ↺', 'L2': 'Left face 180°',
+    'U': 'Up face clockwise ↻', "U'": 'Up face counter-clockwise ↺', 'U2': 'Up face 180°',
+    'D': 'Down face clockwise ↻', "D'": 'Down face counter-clockwise ↺', 'D2': 'Down face 180°',
+    'F': 'Front face clockwise ↻', "F'": 'Front face counter-clockwise ↺', 'F2': 'Front face 180°',
+    'B': 'Back face clockwise ↻', "B'": 'Back face counter-clockwise ↺', 'B2': 'Back face 180°'
+}
+
+# Emoji for each color id
+EMOJI_ARR = np.array([COLORS[c] for c in COLOR_CODES])
+
+# Empty cells of the net, a full-width space to line up with the emoji
+NET_BLANK = '\u3000'
+
+def _build_net_layout():
+    """Place each sticker on the 9x12 grid of the classic unfolded net"""
+    # U on top, then the L F R B belt, then D, with U and D over the F column
+    corners = {'U': (0, 3), 'L': (3, 0), 'F': (3, 3), 'R': (3, 6), 'B': (3, 9), 'D': (6, 3)}
+    rows = np.empty(54, dtype=np.intp)
+    cols = np.empty(54, dtype=np.intp)
+    for face, (row, col) in corners.items():
+        stickers = slice(FACE[face] * 9, FACE[face] * 9 + 9)
+        rows[stickers] = row + np.arange(9) // 3
+        cols[stickers] = col + np.arange(9) % 3
+    return rows, cols
+
+NET_ROWS, NET_COLS = _build_net_layout()
 
 def display_cube_net(cube):
     """Display cube as an unfolded net"""
     st.markdown("### 🎯 Cube Net Layout")
+    # The blank cells never change, so only the 54 sticker cells are written per redraw
+    if 'net_state' not in st.session_state:
+        st.session_state.net_state = np.full((9, 12), NET_BLANK)
+    net_state = st.session_state.net_state
+    net_state[NET_ROWS, NET_COLS] = EMOJI_ARR[cube.flat]
     
-    # Create the classic cube net layout
-    net_html = f"""
-    <div style="font-family: monospace; font-size: 20px; line-height: 1.2; text-align: center;">
-        <div style="margin: 10px 0;">
-            {"".join("&nbsp;" for _ in range(9))}
-            {"".join(COLORS.get(cube.faces['U'][0][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join("&nbsp;" for _ in range(9))}
-            {"".join(COLORS.get(cube.faces['U'][1][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join("&nbsp;" for _ in range(9))}
-            {"".join(COLORS.get(cube.faces['U'][2][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join(COLORS.get(cube.faces['L'][0][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['F'][0][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['R'][0][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['B'][0][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join(COLORS.get(cube.faces['L'][1][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['F'][1][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['R'][1][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['B'][1][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join(COLORS.get(cube.faces['L'][2][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['F'][2][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['R'][2][j], '⬛') for j in range(3))}
-            {"".join(COLORS.get(cube.faces['B'][2][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join("&nbsp;" for _ in range(9))}
-            {"".join(COLORS.get(cube.faces['D'][0][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join("&nbsp;" for _ in range(9))}
-            {"".join(COLORS.get(cube.faces['D'][1][j], '⬛') for j in range(3))}
-        </div>
-        <div style="margin: 10px 0;">
-            {"".join("&nbsp;" for _ in range(9))}
-            {"".join(COLORS.get(cube.faces['D'][2][j], '⬛') for j in range(3))}
-        </div>
-    </div>
-    """
-    st.markdown(net_html, unsafe_allow_html=True)
+    net_text = "\n".join("".join(row) for row in net_state)
+    st.markdown(f'<pre style="font-size: 20px; line-height: 1.2;">{net_text}</pre>', unsafe_allow_html=True)
+
+def cube_panel():
+    """Display the cube net and its status, advancing any running animation by one move"""
+    # The last frame has had its full delay, so redraw the whole page to leave animation mode
+    if st.session_state.animating and st.session_state.animation_step >= len(st.session_state.solution_moves):
+        st.session_state.animating = False
+        st.success("✅ **ANIMATION COMPLETE! CUBE SOLVED!** 🎉")
+        st.balloons()
+        st.rerun()
+    
+    animating = st.session_state.animating
+    
+    # Display cube net with animation status
+    if animating:
+        current_move = st.session_state.solution_moves[st.session_state.animation_step]
+        st.markdown(f"### 🎬 Live Animation - Step {st.session_state.animation_step + 1}: **{current_move}**")
+    else:
+        st.markdown("### 🎯 Cube Net Layout")
+    
+    display_cube_net(st.session_state.cube)
+    
+    # Show cube status
+    if st.session_state.cube.is_solved():
+        st.success("✅ Cube is SOLVED!")
+    elif animating:
+        progress = (st.session_state.animation_step + 1) / len(st.session_state.solution_moves)
+        st.progress(progress)
+        st.info(f"🎬 Animation in progress... {st.session_state.animation_step + 1}/{len(st.session_state.solution_moves)} moves")
+    else:
+        st.info("🔄 Cube needs solving")
+    
+    if animating:
+        # Show current move info
+        st.info(f"🎯 Executing: **{current_move}** - _{MOVE_MEANINGS.get(current_move, current_move)}_")
+        
+        # Jump the main cube to the state after this move, shown on the next fragment run
+        step_perm = st.session_state.animation_perms[st.session_state.animation_step]
+        st.session_state.cube.flat = st.session_state.animation_start[step_perm]
+        st.session_state.animation_step += 1
 
 def main():
     st.set_page_config(page_title="🧩 Rubik's Cube Solver", layout="wide")
@@ -377,30 +459,13 @@ def main():
         st.session_state.solving = False
         st.session_state.animating = False
         st.session_state.animation_step = 0
+        
+        # Compile and load the solver in the background while the user looks at the cube
+        threading.Thread(target=_warm_up, daemon=True).start()
     
     # Create main layout
     col1, col2 = st.columns([2, 1])
     
-    with col1:
-        # Display cube net with animation status
-        if hasattr(st.session_state, 'animating') and st.session_state.animating and hasattr(st.session_state, 'animation_step') and st.session_state.animation_step < len(st.session_state.solution_moves):
-            current_move = st.session_state.solution_moves[st.session_state.animation_step]
-            st.markdown(f"### 🎬 Live Animation - Step {st.session_state.animation_step + 1}: **{current_move}**")
-        else:
-            st.markdown("### 🎯 Cube Net Layout")
-        
-        display_cube_net(st.session_state.cube)
-        
-        # Show cube status
-        if st.session_state.cube.is_solved():
-            st.success("✅ Cube is SOLVED!")
-        elif hasattr(st.session_state, 'animating') and st.session_state.animating:
-            progress = (st.session_state.animation_step + 1) / len(st.session_state.solution_moves) if st.session_state.solution_moves else 0
-            st.progress(progress)
-            st.info(f"🎬 Animation in progress... {st.session_state.animation_step + 1}/{len(st.session_state.solution_moves)} moves")
-        else:
-            st.info("🔄 Cube needs solving")
-    
     with col2:
         st.header("🎮 Controls")
         
@@ -412,6 +477,8 @@ def main():
                 st.session_state.cube = RubiksCube()
                 st.session_state.scramble_moves = st.session_state.cube.scramble(25)
                 st.session_state.solution_moves = []
+                st.session_state.animating = False
+                st.session_state.animation_step = 0
                 st.rerun()
         
         with col_btn2:
@@ -419,12 +486,16 @@ def main():
                 st.session_state.cube = RubiksCube()
                 st.session_state.scramble_moves = []
                 st.session_state.solution_moves = []
+                st.session_state.animating = False
+                st.session_state.animation_step = 0
                 st.rerun()
         
         # Solve button
         if st.button("🧠 SOLVE CUBE", type="secondary", use_container_width=True):
             with st.spinner("🤔 Computing optimal solution..."):
                 st.session_state.solution_moves = st.session_state.cube.solve_with_kociemba()
+                st.session_state.animating = False
+                st.session_state.animation_step = 0
                 if st.session_state.solution_moves:
                     st.success(f"✅ Solution found in {len(st.session_state.solution_moves)} moves!")
             st.rerun()
@@ -442,26 +513,25 @@ def main():
             st.code(solution_text, language=None)
             
             # Animation speed control
-            animation_speed = st.select_slider(
+            st.select_slider(
                 "⚡ Animation Speed",
                 options=[0.2, 0.5, 0.8, 1.0, 1.5, 2.0],
                 value=0.8,
-                format_func=lambda x: f"{x}s per move"
+                format_func=lambda x: f"{x}s per move",
+                key="animation_speed"
             )
             
             # Test solution button
             if st.button("🧪 Test Solution", use_container_width=True):
                 # Create test cube and apply solution
                 test_cube = RubiksCube()
-                for face in test_cube.faces:
-                    test_cube.faces[face] = [row[:] for row in st.session_state.cube.faces[face]]
+                test_cube.f = st.session_state.cube.f.copy()
                 
                 st.write("**Before solution:**")
                 st.write(f"Solved: {test_cube.is_solved()}")
                 
                 # Apply solution
-                for move in st.session_state.solution_moves:
-                    test_cube.execute_move(move)
+                test_cube.execute_moves(st.session_state.solution_moves)
                 
                 st.write("**After solution:**")
                 st.write(f"Solved: {test_cube.is_solved()}")
@@ -479,6 +549,9 @@ def main():
                     if st.button("▶️ Animate Solution", use_container_width=True):
                         st.session_state.animating = True
                         st.session_state.animation_step = 0
+                        # Each frame is then a single gather from the starting state
+                        st.session_state.animation_start = st.session_state.cube.flat.copy()
+                        st.session_state.animation_perms = accumulate_moves(st.session_state.solution_moves)
                         st.rerun()
                 else:
                     # Animation controls during animation
@@ -492,50 +565,17 @@ def main():
                             st.session_state.animating = False
                             st.session_state.animation_step = 0
                             st.rerun()
-                
-                # Auto-advance animation
-                if (getattr(st.session_state, 'animating', False) and 
-                    getattr(st.session_state, 'animation_step', 0) < len(st.session_state.solution_moves)):
-                    
-                    # Execute next move
-                    current_move = st.session_state.solution_moves[st.session_state.animation_step]
-                    
-                    # Show current move info
-                    move_meanings = {
-                        'R': 'Right face clockwise ↻', "R'": 'Right face counter-clockwise ↺', 'R2': 'Right face 180°',
-                        'L': 'Left face clockwise ↻', "L'": 'Left face counter-clockwise ↺', 'L2': 'Left face 180°',
-                        'U': 'Up face clockwise ↻', "U'": 'Up face counter-clockwise ↺', 'U2': 'Up face 180°',
-                        'D': 'Down face clockwise ↻', "D'": 'Down face counter-clockwise ↺', 'D2': 'Down face 180°',
-                        'F': 'Front face clockwise ↻', "F'": 'Front face counter-clockwise ↺', 'F2': 'Front face 180°',
-                        'B': 'Back face clockwise ↻', "B'": 'Back face counter-clockwise ↺', 'B2': 'Back face 180°'
-                    }
-                    
-                    st.info(f"🎯 Executing: **{current_move}** - _{move_meanings.get(current_move, current_move)}_")
-                    
-                    # Execute the move on the main cube
-                    st.session_state.cube.execute_move(current_move)
-                    st.session_state.animation_step += 1
-                    
-                    # Auto-advance with delay
-                    time.sleep(animation_speed)
-                    
-                    # Check if animation is complete
-                    if st.session_state.animation_step >= len(st.session_state.solution_moves):
-                        st.session_state.animating = False
-                        st.success("✅ **ANIMATION COMPLETE! CUBE SOLVED!** 🎉")
-                        st.balloons()
-                    
-                    st.rerun()
-            
+
             with col_solve2:
                 # Apply solution to actual cube
                 if st.button("🎯 Apply Solution", use_container_width=True):
                     # Apply solution moves to the actual cube
-                    for move in st.session_state.solution_moves:
-                        st.session_state.cube.execute_move(move)
+                    st.session_state.cube.execute_moves(st.session_state.solution_moves)
                     
                     # Clear solution moves since they've been applied
                     st.session_state.solution_moves = []
+                    st.session_state.animating = False
+                    st.session_state.animation_step = 0
                     st.success("✅ Solution applied to cube!")
                     st.rerun()
         
@@ -561,20 +601,22 @@ def main():
             
             if st.button("💾 Update Cube", use_container_width=True):
                 try:
-                    valid_colors = set('WYROBG')
                     all_valid = True
                     
                     for face_key, face_input in face_inputs.items():
                         if len(face_input) != 9:
                             st.error(f"Face {face_key} must have exactly 9 characters")
                             all_valid = False
-                        elif not all(c.upper() in valid_colors for c in face_input):
+                        # Anything left after deleting the valid color letters is invalid
+                        elif face_input.upper().encode('ascii', 'replace').translate(None, COLOR_BYTES):
                             st.error(f"Face {face_key} contains invalid colors")
                             all_valid = False
                     
                     if all_valid:
                         for face_key, face_input in face_inputs.items():
                             st.session_state.cube.set_face_from_string(face_key, face_input.upper())
+                        st.session_state.animating = False
+                        st.session_state.animation_step = 0
                         st.success("✅ Cube updated!")
                         st.rerun()
                         
@@ -604,6 +646,12 @@ def main():
             st.write("**Color Legend:**")
             for color_code, color_name in COLOR_NAMES.items():
                 st.write(f"{COLORS[color_code]} = {color_code} ({color_name})")
+    
+    # While animating, the panel is a fragment that reruns on its own once per move,
+    # so each frame redraws only the cube instead of the whole page
+    with col1:
+        run_every = st.session_state.animation_speed if st.session_state.animating else None
+        st.fragment(cube_panel, run_every=run_every)()
 
 if __name__ == "__main__":
     main()